@@ -1,92 +1,163 @@
 import json
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Sequence
 from pathlib import Path
 import math
-from utils.geo_utils import calculate_heading, lat_lon_to_meters, distance_to_segment, haversine_distance
+import logging
+from utils.geo_utils import calculate_heading, lat_lon_to_meters, local_origin, project_to_line, segment_distance_sq
 
+logger = logging.getLogger(__name__)
+
+# Edge length in meters of the grid cells used to bucket holding points
+HOLDING_GRID_CELL = 22.0
+# Edge length in meters of the grid cells used to bucket taxiway segments
+SEGMENT_GRID_CELL = 50.0
+
+# is_on_runway and get_nearest_taxiway take their thresholds in degrees; 1 degree is
+# taken as roughly 111,000 meters, as at the equator
+METERS_PER_THRESHOLD_DEGREE = 111000
+
+# Default get_nearest_parking radius in meters, about the 0.0002 degrees the old default was
+# written as
+PARKING_THRESHOLD = 22.0
+
+# Default is_at_holding_point radius in meters. The old default of 0.002 was meant as degrees,
+# about 222 m, which would cover the runway next to most holding points; PositionDetector checks
+# holding points before runways, so the radius is kept to the holding position itself
+HOLDING_POINT_THRESHOLD = 22.0
+
+# Resolved layout path -> ((mtime_ns, size), loaded attributes), shared by all managers
+_LAYOUT_CACHE: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+# AirportManager attributes filled in from a layout file, i.e. everything the cache restores
+_LAYOUT_ATTRS = ('name', 'icao', 'runways', 'taxiways', 'parking_positions', 'holding_points',
+                 '_origin', '_segments', '_segment_grid', '_segment_grid_bounds',
+                 '_adjacency', '_holding_xy', '_holding_grid')
+
+def _endpoint_key(point: Sequence[float]) -> Tuple[float, float]:
+    """Round a coordinate so that the same point read twice from JSON always matches."""
+    return (round(point[0], 7), round(point[1], 7))
+
+# The layout classes declare __slots__ by hand rather than dataclass(slots=True),
+# which needs Python 3.10; that is also why none of their fields has a default.
 @dataclass
 class Runway:
+    __slots__ = ('name', 'threshold1_coords', 'threshold2_coords', 'width', 'length',
+                 '_heading', '_origin', '_t1_m', '_vec', '_len_sq')
+    
     name: str
     threshold1_coords: Tuple[float, float]
     threshold2_coords: Tuple[float, float]
     width: float
     length: float
-    _heading: Optional[float] = None
+    _heading: Optional[float]
 
     def __init__(self, name: str, threshold1_coords: List[float], threshold2_coords: List[float], 
-                 width: float, length: float, heading: Optional[float] = None):
+                 width: float, length: float, heading: Optional[float] = None,
+                 origin: Optional[Tuple[float, float, float]] = None):
         self.name = name
-        self.threshold1_coords = tuple(threshold1_coords)
-        self.threshold2_coords = tuple(threshold2_coords)
+        self.threshold1_coords = _as_coords(threshold1_coords)
+        self.threshold2_coords = _as_coords(threshold2_coords)
         self.width = width
         self.length = length
+        # Calculate heading from threshold coordinates once, it never changes
+        if heading is None:
+            heading = calculate_heading(self.threshold1_coords[0], self.threshold1_coords[1],
+                                        self.threshold2_coords[0], self.threshold2_coords[1])
         self._heading = heading
 
+        # Thresholds never move after loading, so project them to meters once
+        self._origin = origin if origin is not None else local_origin(*self.threshold1_coords)
+        self._t1_m = lat_lon_to_meters(self.threshold1_coords[0], self.threshold1_coords[1], self._origin)
+        t2_m = lat_lon_to_meters(self.threshold2_coords[0], self.threshold2_coords[1], self._origin)
+        self._vec = (t2_m[0] - self._t1_m[0], t2_m[1] - self._t1_m[1])
+        self._len_sq = self._vec[0]**2 + self._vec[1]**2
+
     @property
     def heading(self) -> float:
-        if self._heading is not None:
-            return self._heading
-        # Calculate heading from threshold coordinates
-        lat1, lon1 = self.threshold1_coords
-        lat2, lon2 = self.threshold2_coords
-        return calculate_heading(lat1, lon1, lat2, lon2)
+        return self._heading
+
+    def project(self, position: Tuple[float, float]) -> Tuple[float, float]:
+        """Project a position onto the center line.
+        
+        Returns the projection parameter (0 at threshold1, 1 at threshold2) and
+        the squared perpendicular distance to the center line in square meters."""
+        # Only the aircraft position needs converting, the runway is precomputed
+        px, py = lat_lon_to_meters(position[0], position[1], self._origin)
+        return project_to_line(px, py, self._t1_m[0], self._t1_m[1],
+                               self._vec[0], self._vec[1], self._len_sq)
 
     def distance_to_center(self, position: Tuple[float, float]) -> float:
         """Calculate the perpendicular distance from the given position to the runway center line."""
-        # Convert all coordinates to meters
-        pos_meters = lat_lon_to_meters(position[0], position[1])
-        threshold1_meters = lat_lon_to_meters(self.threshold1_coords[0], self.threshold1_coords[1])
-        threshold2_meters = lat_lon_to_meters(self.threshold2_coords[0], self.threshold2_coords[1])
-        
-        # Calculate runway center line vector
-        runway_vector = (threshold2_meters[0] - threshold1_meters[0], 
-                        threshold2_meters[1] - threshold1_meters[1])
-        
-        # Calculate vector from threshold1 to aircraft
-        aircraft_vector = (pos_meters[0] - threshold1_meters[0],
-                         pos_meters[1] - threshold1_meters[1])
-        
-        # Calculate projection parameter
-        runway_length_squared = runway_vector[0]**2 + runway_vector[1]**2
-        if runway_length_squared == 0:
+        if self._len_sq == 0:
             return float('inf')
-            
-        projection = (aircraft_vector[0] * runway_vector[0] + aircraft_vector[1] * runway_vector[1]) / runway_length_squared
         
-        # Calculate perpendicular distance to center line
-        projected_point = (threshold1_meters[0] + projection * runway_vector[0],
-                         threshold1_meters[1] + projection * runway_vector[1])
-        
-        distance_to_center = ((pos_meters[0] - projected_point[0])**2 + 
-                            (pos_meters[1] - projected_point[1])**2)**0.5
-        
-        return distance_to_center
+        _, distance_sq = self.project(position)
+        return math.sqrt(distance_sq)
 
 @dataclass
 class TaxiwaySegment:
+    __slots__ = ('start', 'end', 'width', '_origin', '_start_m', '_vec', '_len_sq')
+    
     start: Tuple[float, float]
     end: Tuple[float, float]
     width: float
 
+    def __init__(self, start: List[float], end: List[float], width: float,
+                 origin: Optional[Tuple[float, float, float]] = None):
+        self.start = _as_coords(start)
+        self.end = _as_coords(end)
+        self.width = width
+        # Segment endpoints are static, so keep their projection in meters
+        self._origin = origin if origin is not None else local_origin(*self.start)
+        self._start_m = lat_lon_to_meters(self.start[0], self.start[1], self._origin)
+        end_m = lat_lon_to_meters(self.end[0], self.end[1], self._origin)
+        self._vec = (end_m[0] - self._start_m[0], end_m[1] - self._start_m[1])
+        self._len_sq = self._vec[0]**2 + self._vec[1]**2
+
+    def distance_sq_to_meters(self, pos_meters: Tuple[float, float]) -> float:
+        """Calculate the squared distance from a position already converted to meters
+        around this segment's origin."""
+        if self._len_sq == 0:
+            return float('inf')
+
+        return segment_distance_sq(pos_meters[0], pos_meters[1],
+                                   self._start_m[0], self._start_m[1],
+                                   self._vec[0], self._vec[1], self._len_sq)
+
 @dataclass
 class Taxiway:
+    __slots__ = ('name', 'segments', '_endpoints')
+    
     name: str
-    segments: List[TaxiwaySegment]
+    segments: Sequence[TaxiwaySegment]
+
+    def __post_init__(self):
+        # Every segment endpoint, rounded so shared vertices compare equal
+        self._endpoints = {_endpoint_key(point)
+                           for segment in self.segments
+                           for point in (segment.start, segment.end)}
 
     def distance_to(self, position: Tuple[float, float]) -> float:
         """Calculate the perpendicular distance from the given position to the nearest taxiway segment."""
-        min_distance = float('inf')
+        min_distance_sq = float('inf')
+        origin = pos_meters = None
         
         for segment in self.segments:
-            distance = distance_to_segment(position, segment.start, segment.end)
-            if distance < min_distance:
-                min_distance = distance
+            # Segments loaded by AirportManager share one origin, so this projects once
+            if segment._origin is not origin:
+                origin = segment._origin
+                pos_meters = lat_lon_to_meters(position[0], position[1], origin)
+            distance_sq = segment.distance_sq_to_meters(pos_meters)
+            if distance_sq < min_distance_sq:
+                min_distance_sq = distance_sq
         
-        return min_distance
+        return math.sqrt(min_distance_sq)
 
 @dataclass
 class ParkingPosition:
+    __slots__ = ('name', 'coords', 'type', 'elevation', 'heading', 'size', '_origin', '_xy')
+    
     name: str
     coords: Tuple[float, float]
     type: str
@@ -94,134 +165,248 @@ class ParkingPosition:
     heading: float
     size: float
     
-    def __init__(self, name: str, coords: List[float], type: str, elevation: float, heading: float, size: float):
+    def __init__(self, name: str, coords: List[float], type: str, elevation: float, heading: float, size: float,
+                 origin: Optional[Tuple[float, float, float]] = None):
         self.name = name
-        self.coords = tuple(coords)
+        self.coords = _as_coords(coords)
         self.type = type
         self.elevation = elevation
         self.heading = heading
         self.size = size
+        self._origin = origin if origin is not None else local_origin(*self.coords)
+        self._xy = lat_lon_to_meters(self.coords[0], self.coords[1], self._origin)
     
     def distance_to(self, position: Tuple[float, float]) -> float:
         """Calculate the distance to another position in meters."""
-        return haversine_distance(
-            self.coords[0], self.coords[1],
-            position[0], position[1]
-        )
+        x, y = lat_lon_to_meters(position[0], position[1], self._origin)
+        return math.hypot(x - self._xy[0], y - self._xy[1])
 
 @dataclass
 class HoldingPoint:
+    __slots__ = ('name', 'coords', 'associated_with', '_origin', '_xy')
+    
     name: str
     coords: Tuple[float, float]
     associated_with: str
 
-    def __init__(self, name: str, coords: List[float], associated_with: str):
+    def __init__(self, name: str, coords: List[float], associated_with: str,
+                 origin: Optional[Tuple[float, float, float]] = None):
         self.name = name
-        self.coords = tuple(coords)
+        self.coords = _as_coords(coords)
         self.associated_with = associated_with
+        self._origin = origin if origin is not None else local_origin(*self.coords)
+        self._xy = lat_lon_to_meters(self.coords[0], self.coords[1], self._origin)
 
     def distance_to(self, position: Tuple[float, float]) -> float:
         """Calculate the distance to another position in meters."""
-        return haversine_distance(
-            self.coords[0], self.coords[1],
-            position[0], position[1]
-        )
+        x, y = lat_lon_to_meters(position[0], position[1], self._origin)
+        return math.hypot(x - self._xy[0], y - self._xy[1])
+
+def _as_coords(values: List[float]) -> Tuple[float, float]:
+    """Normalize a JSON [lat, lon] pair to a tuple of floats."""
+    return (float(values[0]), float(values[1]))
+
+def _ring_cells(cx: int, cy: int, ring: int):
+    """Yield the grid cells at exactly `ring` cells (Chebyshev distance) from (cx, cy)."""
+    if ring == 0:
+        yield (cx, cy)
+        return
+    for dx in range(-ring, ring + 1):
+        yield (cx + dx, cy - ring)
+        yield (cx + dx, cy + ring)
+    for dy in range(-ring + 1, ring):
+        yield (cx - ring, cy + dy)
+        yield (cx + ring, cy + dy)
+
+def _reference_coords(data: dict) -> Tuple[float, float]:
+    """Pick the origin for the local plane: the first runway threshold, else any coordinate."""
+    for runway in data.get('runways', []):
+        return _as_coords(runway['threshold1_coords'])
+    for taxiway in data.get('taxiways', []):
+        for segment in taxiway['segments']:
+            return _as_coords(segment['start'])
+    for feature in ('parking_positions', 'holding_points'):
+        for item in data.get(feature, []):
+            return _as_coords(item['coords'])
+    return (0.0, 0.0)
 
 class AirportManager:
     def __init__(self, layout_file: str = "airport_layout.json"):
         self.layout_file = Path(layout_file)
         self.name: str = ""
         self.icao: str = ""
-        self.runways: List[Runway] = []
-        self.taxiways: List[Taxiway] = []
-        self.parking_positions: List[ParkingPosition] = []
-        self.holding_points: List[HoldingPoint] = []
+        # The features are shared with other managers through the layout cache and indexed by
+        # the lookup structures below, so they are kept in read-only tuples
+        self.runways: Tuple[Runway, ...] = ()
+        self.taxiways: Tuple[Taxiway, ...] = ()
+        self.parking_positions: Tuple[ParkingPosition, ...] = ()
+        self.holding_points: Tuple[HoldingPoint, ...] = ()
+        # Local tangent plane shared by every feature of the airport
+        self._origin: Tuple[float, float, float] = local_origin(0.0, 0.0)
+        # Flat (start_x, start_y, vec_x, vec_y, len_sq, taxiway index, segment index) rows,
+        # one per segment
+        self._segments: List[Tuple[float, float, float, float, float, int, int]] = []
+        # Grid cell -> indices into _segments of the segments whose bounding box overlaps it,
+        # plus the (min_x, min_y, max_x, max_y) cell range the grid covers
+        self._segment_grid: Dict[Tuple[int, int], List[int]] = {}
+        self._segment_grid_bounds: Tuple[int, int, int, int] = (0, 0, -1, -1)
+        # Taxiway index -> indices of the taxiways sharing a segment endpoint with it. Taxiways
+        # are kept apart even when they share a name, as several unconnected pieces often do
+        self._adjacency: List[List[int]] = []
+        # (start taxiway index, end taxiway index) -> route found by the last search
+        self._route_cache: Dict[Tuple[int, int], List[str]] = {}
+        # Holding positions in local meters, parallel to their list
+        self._holding_xy: List[Tuple[float, float]] = []
+        # Grid cell -> indices of the holding points inside it
+        self._holding_grid: Dict[Tuple[int, int], List[int]] = {}
         self.load_layout()
     
     def load_layout(self) -> None:
-        """Load the airport layout from the JSON file."""
+        """Load the airport layout from the JSON file.
+        
+        Layouts are cached per file, so managers loading an unchanged file share the
+        already built features instead of parsing it again."""
         try:
-            with open(self.layout_file, 'r') as f:
-                data = json.load(f)
-            
-            self.name = data.get('name', '')
-            self.icao = data.get('icao', '')
-            
-            # Load runways
-            self.runways = []
-            for runway_data in data.get('runways', []):
-                runway = Runway(
-                    name=runway_data['name'],
-                    threshold1_coords=runway_data['threshold1_coords'],
-                    threshold2_coords=runway_data['threshold2_coords'],
-                    width=runway_data['width'],
-                    length=runway_data['length']
-                )
-                self.runways.append(runway)
-            
-            # Load taxiways
-            self.taxiways = []
-            for taxiway_data in data.get('taxiways', []):
-                segments = []
-                for segment_data in taxiway_data['segments']:
-                    segment = TaxiwaySegment(
-                        start=tuple(segment_data['start']),
-                        end=tuple(segment_data['end']),
-                        width=segment_data['width']
-                    )
-                    segments.append(segment)
-                taxiway = Taxiway(
-                    name=taxiway_data['name'],
-                    segments=segments
-                )
-                self.taxiways.append(taxiway)
+            stat = self.layout_file.stat()
+            path = str(self.layout_file.resolve())
+            version = (stat.st_mtime_ns, stat.st_size)
+            cached = _LAYOUT_CACHE.get(path)
+            if cached is not None and cached[0] == version:
+                for attr, value in cached[1].items():
+                    setattr(self, attr, value)
+            else:
+                self._read_layout()
+                _LAYOUT_CACHE[path] = (version, {attr: getattr(self, attr) for attr in _LAYOUT_ATTRS})
             
-            # Load parking positions
-            self.parking_positions = []
-            for parking_data in data.get('parking_positions', []):
-                parking = ParkingPosition(
-                    name=parking_data['name'],
-                    coords=tuple(parking_data['coords']),
-                    type=parking_data['type'],
-                    elevation=parking_data['elevation'],
-                    heading=parking_data['heading'],
-                    size=parking_data['size']
-                )
-                self.parking_positions.append(parking)
-            
-            # Load holding points
-            self.holding_points = []
-            for holding_data in data.get('holding_points', []):
-                holding = HoldingPoint(
-                    name=holding_data['name'],
-                    coords=tuple(holding_data['coords']),
-                    associated_with=holding_data['associated_with']
-                )
-                self.holding_points.append(holding)
+            # Routes are cached per manager
+            self._route_cache = {}
             
         except Exception as e:
             raise ValueError(f"Error loading airport layout: {str(e)}")
     
-    def get_nearest_parking(self, position: Tuple[float, float], threshold: float = 0.0002) -> Optional[ParkingPosition]:
-        """Find the nearest parking position to the given coordinates."""
+    def _read_layout(self) -> None:
+        """Parse the JSON file and build the features and lookup structures."""
+        with open(self.layout_file, 'r') as f:
+            data = json.load(f)
+        
+        self.name = data.get('name', '')
+        self.icao = data.get('icao', '')
+        self._origin = origin = local_origin(*_reference_coords(data))
+        
+        # Load runways (the feature constructors normalize coordinates to float
+        # tuples once, so the distance methods never have to convert them per call)
+        self.runways = tuple(
+            Runway(
+                name=runway_data['name'],
+                threshold1_coords=runway_data['threshold1_coords'],
+                threshold2_coords=runway_data['threshold2_coords'],
+                width=runway_data['width'],
+                length=runway_data['length'],
+                origin=origin
+            )
+            for runway_data in data.get('runways', [])
+        )
+        
+        # Load taxiways
+        self.taxiways = tuple(
+            Taxiway(
+                name=taxiway_data['name'],
+                segments=tuple(
+                    TaxiwaySegment(
+                        start=segment_data['start'],
+                        end=segment_data['end'],
+                        width=segment_data['width'],
+                        origin=origin
+                    )
+                    for segment_data in taxiway_data['segments']
+                )
+            )
+            for taxiway_data in data.get('taxiways', [])
+        )
+        
+        # Flatten all segments so nearest-segment scans are a single loop
+        self._segments = [
+            (segment._start_m[0], segment._start_m[1], segment._vec[0], segment._vec[1],
+             segment._len_sq, t, i)
+            for t, taxiway in enumerate(self.taxiways)
+            for i, segment in enumerate(taxiway.segments)
+            if segment._len_sq != 0
+        ]
+        self._build_segment_grid()
+        self._adjacency = self._build_adjacency()
+        
+        # Load parking positions
+        self.parking_positions = tuple(
+            ParkingPosition(
+                name=parking_data['name'],
+                coords=parking_data['coords'],
+                type=parking_data['type'],
+                elevation=parking_data['elevation'],
+                heading=parking_data['heading'],
+                size=parking_data['size'],
+                origin=origin
+            )
+            for parking_data in data.get('parking_positions', [])
+        )
+        
+        # Load holding points
+        self.holding_points = tuple(
+            HoldingPoint(
+                name=holding_data['name'],
+                coords=holding_data['coords'],
+                associated_with=holding_data['associated_with'],
+                origin=origin
+            )
+            for holding_data in data.get('holding_points', [])
+        )
+        self._holding_xy = [hp._xy for hp in self.holding_points]
+        self._holding_grid = {}
+        for i, (x, y) in enumerate(self._holding_xy):
+            cell = (math.floor(x / HOLDING_GRID_CELL), math.floor(y / HOLDING_GRID_CELL))
+            self._holding_grid.setdefault(cell, []).append(i)
+    
+    def get_nearest_parking(self, position: Tuple[float, float],
+                            threshold: float = PARKING_THRESHOLD) -> Optional[ParkingPosition]:
+        """Find the nearest parking position within threshold meters of the given coordinates."""
         if not self.parking_positions:
             return None
             
-        nearest = min(self.parking_positions, key=lambda p: p.distance_to(position))
-        dist = nearest.distance_to(position)
-        if dist <= threshold:
-            print(f"DEBUG: Nearest parking {nearest.name} detected")
-            return nearest
-        return None
+        px, py = lat_lon_to_meters(position[0], position[1], self._origin)
+        nearest = self._nearest_parking_at(px, py, threshold * threshold)
+        if nearest:
+            logger.debug("Nearest parking %s detected", nearest.name)
+        return nearest
+    
+    def get_nearest_parking_batch(self, positions: Sequence[Tuple[float, float]],
+                                  threshold: float = PARKING_THRESHOLD) -> List[Optional[ParkingPosition]]:
+        """Find the nearest parking position within threshold meters for each of several positions."""
+        threshold_sq = threshold * threshold
+        return [self._nearest_parking_at(*lat_lon_to_meters(lat, lon, self._origin), threshold_sq)
+                for lat, lon in positions]
+    
+    def _nearest_parking_at(self, px: float, py: float, threshold_sq: float) -> Optional[ParkingPosition]:
+        """Find the nearest parking position to a point in local meters, if within the threshold."""
+        nearest = None
+        min_distance_sq = float('inf')
+        for parking in self.parking_positions:
+            x, y = parking._xy
+            distance_sq = (x - px)**2 + (y - py)**2
+            if distance_sq < min_distance_sq:
+                min_distance_sq = distance_sq
+                nearest = parking
+        
+        return nearest if min_distance_sq <= threshold_sq else None
     
     def get_active_runway(self, wind_direction: float) -> Optional[Runway]:
         """Determine the active runway based on wind direction."""
         if not self.runways:
             return None
             
-        # Simple logic: choose runway with heading closest to wind direction
-        active_runway = min(self.runways, key=lambda r: abs((r.heading - wind_direction) % 360))
-        print(f"DEBUG: Active runway: {active_runway.name} (heading: {active_runway.heading})")
+        # Simple logic: choose runway with heading closest to wind direction,
+        # measuring the difference around the circle so 350° and 10° are 20° apart
+        active_runway = min(self.runways,
+                            key=lambda runway: abs((runway.heading - wind_direction + 180) % 360 - 180))
+        logger.debug("Active runway: %s (heading: %s)", active_runway.name, active_runway.heading)
         return active_runway
     
     def get_taxi_route(self, start: Tuple[float, float], end: Tuple[float, float]) -> List[str]:
@@ -230,82 +415,179 @@ class AirportManager:
             return []
             
         # Find the nearest taxiway segments to start and end points
-        start_segment = self._find_nearest_taxiway_segment(start)
-        end_segment = self._find_nearest_taxiway_segment(end)
+        start_segment = self._nearest_segment(start)
+        end_segment = self._nearest_segment(end)
         
         if not start_segment or not end_segment:
             return []
-            
-        # Simple pathfinding: find a path through connected taxiways
-        route = []
-        current_taxiway = start_segment[0]  # (taxiway_name, segment_index)
-        end_taxiway = end_segment[0]
         
+        start_taxiway, end_taxiway = start_segment[0], end_segment[0]
         # If we're already on the same taxiway as the destination
-        if current_taxiway[0] == end_taxiway[0]:
-            return [current_taxiway[0]]
+        if self.taxiways[start_taxiway].name == self.taxiways[end_taxiway].name:
+            return [self.taxiways[start_taxiway].name]
             
-        # Try to find a path through connected taxiways
-        visited = set()
-        queue = [(current_taxiway[0], [current_taxiway[0]])]
+        # Routes only depend on the pair of taxiways, so reuse earlier searches
+        key = (start_taxiway, end_taxiway)
+        route = self._route_cache.get(key)
+        if route is None:
+            route = []
+            for t in self._search_route(start_taxiway, end_taxiway):
+                # Consecutive pieces of one taxiway read as a single leg of the route
+                name = self.taxiways[t].name
+                if not route or route[-1] != name:
+                    route.append(name)
+            self._route_cache[key] = route
+        return list(route)
+    
+    def _search_route(self, start_taxiway: int, end_taxiway: int) -> List[int]:
+        """Find the shortest chain of connected taxiways between two taxiways, by index."""
+        # Breadth-first search over the precomputed taxiway graph
+        visited = {start_taxiway}
+        queue = deque([(start_taxiway, [start_taxiway])])
         
         while queue:
-            current, path = queue.pop(0)
-            if current == end_taxiway[0]:
+            current, path = queue.popleft()
+            if current == end_taxiway:
                 return path
                 
-            if current in visited:
-                continue
-                
-            visited.add(current)
-            
-            # Find connected taxiways
-            for taxiway in self.taxiways:
-                if taxiway.name != current and self._are_taxiways_connected(current, taxiway.name):
-                    queue.append((taxiway.name, path + [taxiway.name]))
+            for neighbor in self._adjacency[current]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    queue.append((neighbor, path + [neighbor]))
         
         return []
     
-    def _find_nearest_taxiway_segment(self, position: Tuple[float, float]) -> Optional[Tuple[Tuple[str, int], float]]:
-        """Find the nearest taxiway segment to a position."""
-        nearest = None
-        min_distance = float('inf')
+    def _build_adjacency(self) -> List[List[int]]:
+        """Connect taxiways that share a segment endpoint, keeping neighbors in layout order."""
+        taxiways_at: Dict[Tuple[float, float], List[int]] = {}
+        for t, taxiway in enumerate(self.taxiways):
+            for key in taxiway._endpoints:
+                taxiways_at.setdefault(key, []).append(t)
         
-        for taxiway in self.taxiways:
-            for i, segment in enumerate(taxiway.segments):
-                # Calculate distance to segment
-                distance = distance_to_segment(position, segment.start, segment.end)
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest = ((taxiway.name, i), distance)
+        neighbors = [set() for _ in self.taxiways]
+        for linked in taxiways_at.values():
+            if len(linked) > 1:
+                for t in linked:
+                    neighbors[t].update(linked)
         
-        return nearest
+        return [sorted(linked - {t}) for t, linked in enumerate(neighbors)]
     
-    def _are_taxiways_connected(self, taxiway1: str, taxiway2: str) -> bool:
-        """Check if two taxiways are connected."""
-        # Find the taxiways
-        tw1 = next((t for t in self.taxiways if t.name == taxiway1), None)
-        tw2 = next((t for t in self.taxiways if t.name == taxiway2), None)
+    def _build_segment_grid(self) -> None:
+        """Bucket every segment row into the grid cells its bounding box overlaps."""
+        self._segment_grid = {}
+        for row, (sx, sy, vx, vy, _, _, _) in enumerate(self._segments):
+            x0 = math.floor(min(sx, sx + vx) / SEGMENT_GRID_CELL)
+            x1 = math.floor(max(sx, sx + vx) / SEGMENT_GRID_CELL)
+            y0 = math.floor(min(sy, sy + vy) / SEGMENT_GRID_CELL)
+            y1 = math.floor(max(sy, sy + vy) / SEGMENT_GRID_CELL)
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    self._segment_grid.setdefault((cx, cy), []).append(row)
         
-        if not tw1 or not tw2:
-            return False
+        if self._segment_grid:
+            xs = [cx for cx, _ in self._segment_grid]
+            ys = [cy for _, cy in self._segment_grid]
+            self._segment_grid_bounds = (min(xs), min(ys), max(xs), max(ys))
+        else:
+            self._segment_grid_bounds = (0, 0, -1, -1)
+    
+    def _nearest_segment(self, position: Tuple[float, float]) -> Optional[Tuple[int, int, float]]:
+        """Find the segment nearest to a position.
+        
+        Returns the taxiway index, the segment index within that taxiway and the distance."""
+        px, py = lat_lon_to_meters(position[0], position[1], self._origin)
+        cx = math.floor(px / SEGMENT_GRID_CELL)
+        cy = math.floor(py / SEGMENT_GRID_CELL)
+        min_x, min_y, max_x, max_y = self._segment_grid_bounds
+        
+        # Positions away from the taxiways (e.g. in flight) would walk many empty
+        # rings, so only search the grid from inside the area it covers
+        if min_x <= cx <= max_x and min_y <= cy <= max_y:
+            nearest, min_distance_sq = self._nearest_segment_in_grid(px, py, cx, cy)
+        else:
+            nearest = None
+            min_distance_sq = float('inf')
+            # Compare squared distances and take the root only of the winner
+            for row, (sx, sy, vx, vy, len_sq, _, _) in enumerate(self._segments):
+                distance_sq = segment_distance_sq(px, py, sx, sy, vx, vy, len_sq)
+                if distance_sq < min_distance_sq:
+                    min_distance_sq = distance_sq
+                    nearest = row
+        
+        if nearest is None:
+            return None
+        _, _, _, _, _, t, i = self._segments[nearest]
+        return (t, i, math.sqrt(min_distance_sq))
+    
+    def _nearest_segment_in_grid(self, px: float, py: float, cx: int, cy: int) -> Tuple[Optional[int], float]:
+        """Search the segment grid in growing rings of cells around (cx, cy).
+        
+        Returns the row of the nearest segment and its squared distance. Ties go to the
+        earliest row, exactly as in a full scan of the rows."""
+        min_x, min_y, max_x, max_y = self._segment_grid_bounds
+        # Distance from the point to the border of its own cell
+        margin = min(px - cx * SEGMENT_GRID_CELL, (cx + 1) * SEGMENT_GRID_CELL - px,
+                     py - cy * SEGMENT_GRID_CELL, (cy + 1) * SEGMENT_GRID_CELL - py)
+        
+        nearest = None
+        min_distance_sq = float('inf')
+        checked = set()
+        for ring in range(max(cx - min_x, max_x - cx, cy - min_y, max_y - cy) + 1):
+            for cell in _ring_cells(cx, cy, ring):
+                for row in self._segment_grid.get(cell, ()):
+                    if row in checked:
+                        continue
+                    checked.add(row)
+                    sx, sy, vx, vy, len_sq, _, _ = self._segments[row]
+                    distance_sq = segment_distance_sq(px, py, sx, sy, vx, vy, len_sq)
+                    if distance_sq < min_distance_sq or (distance_sq == min_distance_sq and row < nearest):
+                        min_distance_sq = distance_sq
+                        nearest = row
             
-        # Check if any segments of taxiway1 connect to any segments of taxiway2
-        for seg1 in tw1.segments:
-            for seg2 in tw2.segments:
-                # Check if segments share an endpoint
-                if (seg1.start == seg2.start or seg1.start == seg2.end or
-                    seg1.end == seg2.start or seg1.end == seg2.end):
-                    return True
-                    
-        return False
+            # Segments not seen yet lie entirely outside the rings searched so far
+            reach = ring * SEGMENT_GRID_CELL + margin
+            if min_distance_sq < reach * reach:
+                break
+        
+        return nearest, min_distance_sq
     
-    def is_at_holding_point(self, position: Tuple[float, float], threshold: float = 0.002) -> Optional[HoldingPoint]:
-        """Check if the aircraft is at a holding point."""
-        for hp in self.holding_points:
-            if hp.distance_to(position) <= threshold:
-                print(f"DEBUG: Holding point {hp.name} detected")
-                return hp
+    def is_at_holding_point(self, position: Tuple[float, float],
+                            threshold: float = HOLDING_POINT_THRESHOLD) -> Optional[HoldingPoint]:
+        """Check if the aircraft is within threshold meters of a holding point."""
+        px, py = lat_lon_to_meters(position[0], position[1], self._origin)
+        hp = self._holding_point_at(px, py, threshold)
+        if hp:
+            logger.debug("Holding point %s detected", hp.name)
+        return hp
+    
+    def is_at_holding_point_batch(self, positions: Sequence[Tuple[float, float]],
+                                  threshold: float = HOLDING_POINT_THRESHOLD) -> List[Optional[HoldingPoint]]:
+        """Check several positions at once against the holding points."""
+        return [self._holding_point_at(*lat_lon_to_meters(lat, lon, self._origin), threshold)
+                for lat, lon in positions]
+    
+    def _holding_point_at(self, px: float, py: float, threshold: float) -> Optional[HoldingPoint]:
+        """Return the first holding point within the threshold of a point in local meters."""
+        # Only the grid cells the threshold circle can reach need checking
+        reach = math.ceil(threshold / HOLDING_GRID_CELL)
+        if (2 * reach + 1)**2 >= len(self.holding_points):
+            candidates = range(len(self.holding_points))
+        else:
+            cx = math.floor(px / HOLDING_GRID_CELL)
+            cy = math.floor(py / HOLDING_GRID_CELL)
+            # Sorted so the first match in layout order still wins
+            candidates = sorted(
+                i
+                for dx in range(-reach, reach + 1)
+                for dy in range(-reach, reach + 1)
+                for i in self._holding_grid.get((cx + dx, cy + dy), ())
+            )
+        
+        threshold_sq = threshold * threshold
+        for i in candidates:
+            x, y = self._holding_xy[i]
+            if (x - px)**2 + (y - py)**2 <= threshold_sq:
+                return self.holding_points[i]
         return None
     
     def is_on_runway(self, position, runway, threshold=0.002):
@@ -314,81 +596,57 @@ class AirportManager:
         if not runway:
             return False
             
-        # Convert all coordinates to meters
-        pos_meters = lat_lon_to_meters(position[0], position[1])
-        threshold1_meters = lat_lon_to_meters(runway.threshold1_coords[0], runway.threshold1_coords[1])
-        threshold2_meters = lat_lon_to_meters(runway.threshold2_coords[0], runway.threshold2_coords[1])
-        
-        # Calculate runway center line vector
-        runway_vector = (threshold2_meters[0] - threshold1_meters[0], 
-                        threshold2_meters[1] - threshold1_meters[1])
-        
-        # Calculate vector from threshold1 to aircraft
-        aircraft_vector = (pos_meters[0] - threshold1_meters[0],
-                         pos_meters[1] - threshold1_meters[1])
-        
-        # Calculate projection parameter
-        runway_length_squared = runway_vector[0]**2 + runway_vector[1]**2
-        if runway_length_squared == 0:
+        if runway._len_sq == 0:
             return False
-            
-        projection = (aircraft_vector[0] * runway_vector[0] + aircraft_vector[1] * runway_vector[1]) / runway_length_squared
-        
-        # Check if aircraft is between thresholds
-        if projection < 0 or projection > 1:
-            return False
-            
-        # Calculate perpendicular distance to center line
-        projected_point = (threshold1_meters[0] + projection * runway_vector[0],
-                         threshold1_meters[1] + projection * runway_vector[1])
-        
-        distance_to_center = ((pos_meters[0] - projected_point[0])**2 + 
-                            (pos_meters[1] - projected_point[1])**2)**0.5
-        
-        # Convert runway width from meters to degrees (approximate)
-        # 1 degree ≈ 111,000 meters at the equator
-        width_in_degrees = runway.width / 111000
-        
-        # Use the larger of the default threshold or half the runway width
-        effective_threshold = max(threshold, width_in_degrees / 2)
-        
-        # Convert distance to degrees for comparison
-        distance_in_degrees = distance_to_center / 111000
+
+        projection, distance_sq = runway.project(position)
         
-        # Check if aircraft is within runway width
-        is_on_runway = distance_in_degrees <= effective_threshold
+        # Check if aircraft is between thresholds and within runway width
+        is_on_runway = 0 <= projection <= 1 and distance_sq <= self._runway_limit_sq(runway, threshold)
         if is_on_runway:
-            print(f"DEBUG: Aircraft is on runway {runway.name}")
+            logger.debug("Aircraft is on runway %s", runway.name)
         
         return is_on_runway
 
+    def is_on_runway_batch(self, positions: Sequence[Tuple[float, float]], runway: Runway,
+                           threshold: float = 0.002) -> List[bool]:
+        """Check several positions at once against a single runway."""
+        if not runway or runway._len_sq == 0:
+            return [False] * len(positions)
+        
+        limit_sq = self._runway_limit_sq(runway, threshold)
+        results = []
+        for position in positions:
+            projection, distance_sq = runway.project(position)
+            results.append(0 <= projection <= 1 and distance_sq <= limit_sq)
+        return results
+
+    @staticmethod
+    def _runway_limit_sq(runway: Runway, threshold: float) -> float:
+        """Squared distance from the center line, in square meters, still counted as on the runway."""
+        # Use the larger of the default threshold or half the runway width, in meters
+        threshold_meters = max(threshold * METERS_PER_THRESHOLD_DEGREE, runway.width / 2)
+        
+        # Compare squared distances in meters to avoid the square root
+        return threshold_meters * threshold_meters
+
     def get_nearest_taxiway(self, position: Tuple[float, float], threshold: float = 0.0002) -> Optional[Taxiway]:
         """Find the nearest taxiway to the given coordinates."""
         if not self.taxiways:
             return None
             
-        nearest_taxiway = None
-        min_distance = float('inf')
-        
-        for taxiway in self.taxiways:
-            for segment in taxiway.segments:
-                distance = distance_to_segment(position, segment.start, segment.end)
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest_taxiway = taxiway
-        
-        # Convert taxiway width from meters to degrees (approximate)
-        # 1 degree ≈ 111,000 meters at the equator
-        width_in_degrees = nearest_taxiway.segments[0].width / 111000 if nearest_taxiway else 0
-        
-        # Convert the distance from meters to degrees
-        distance_in_degrees = min_distance / 111000
+        nearest = self._nearest_segment(position)
+        if nearest is None:
+            return None
+        t, _, min_distance = nearest
+        nearest_taxiway = self.taxiways[t]
         
-        # Use the larger of the default threshold or half the taxiway width
-        effective_threshold = max(threshold, width_in_degrees / 2)
+        # Use the larger of the default threshold or half the taxiway width, in meters
+        effective_threshold = max(threshold * METERS_PER_THRESHOLD_DEGREE,
+                                  nearest_taxiway.segments[0].width / 2)
         
-        if distance_in_degrees <= effective_threshold:
-            print(f"DEBUG: Aircraft is on taxiway {nearest_taxiway.name} (distance: {min_distance:.1f}m)")
+        if min_distance <= effective_threshold:
+            logger.debug("Aircraft is on taxiway %s (distance: %.1fm)", nearest_taxiway.name, min_distance)
             return nearest_taxiway
             
         return None
\ No newline at end of file
@@ -0,0 +1,251 @@
+import unittest
+import json
+import math
+import os
+import random
+import shutil
+import tempfile
+
+from airport_manager import AirportManager, Runway, HOLDING_GRID_CELL, SEGMENT_GRID_CELL
+from utils.geo_utils import lat_lon_to_meters, local_origin, meters_to_lat_lon, segment_distance_sq
+
+AIRPORT_DATA = os.path.join(os.path.dirname(__file__), 'airport_data')
+
+class TestTaxiRoutes(unittest.TestCase):
+    def setUp(self):
+        # LOWG has many taxiways that share a name, including over a hundred unnamed pieces
+        self.airport_manager = AirportManager(os.path.join(AIRPORT_DATA, "lowg_airport.json"))
+        self.taxiways = self.airport_manager.taxiways
+
+    def test_route_hops_share_an_endpoint(self):
+        """Test that every hop of a route joins two physically connected taxiways"""
+        for start in range(len(self.taxiways)):
+            for end in range(len(self.taxiways)):
+                route = self.airport_manager._search_route(start, end)
+                for current, following in zip(route, route[1:]):
+                    self.assertFalse(
+                        self.taxiways[current]._endpoints.isdisjoint(self.taxiways[following]._endpoints),
+                        f"Route from {start} to {end} jumps from {current} to {following}"
+                    )
+
+    def test_unnamed_taxiways_are_not_merged(self):
+        """Test that unnamed taxiways which do not touch are not treated as connected"""
+        unnamed = [t for t, taxiway in enumerate(self.taxiways) if taxiway.name == '']
+        self.assertGreater(len(unnamed), 1)
+        first = unnamed[0]
+        for other in unnamed[1:]:
+            if self.taxiways[first]._endpoints.isdisjoint(self.taxiways[other]._endpoints):
+                self.assertNotIn(other, self.airport_manager._adjacency[first])
+
+    def test_taxi_route_names_follow_connected_taxiways(self):
+        """Test that consecutive names of a taxi route belong to taxiways sharing an endpoint"""
+        # Route between the midpoints of the first segment of every tenth taxiway
+        positions = []
+        for taxiway in self.taxiways[::10]:
+            segment = taxiway.segments[0]
+            positions.append(((segment.start[0] + segment.end[0]) / 2,
+                              (segment.start[1] + segment.end[1]) / 2))
+
+        for start in positions:
+            for end in positions:
+                route = self.airport_manager.get_taxi_route(start, end)
+                for current, following in zip(route, route[1:]):
+                    self.assertTrue(
+                        any(not a._endpoints.isdisjoint(b._endpoints)
+                            for a in self.taxiways if a.name == current
+                            for b in self.taxiways if b.name == following),
+                        f"Route {route} joins unconnected taxiways {current!r} and {following!r}"
+                    )
+
+class TestNearestSegment(unittest.TestCase):
+    def brute_force(self, airport_manager, px, py):
+        """Scan every segment row, keeping the first of equally near rows."""
+        nearest = None
+        min_distance_sq = float('inf')
+        for row, (sx, sy, vx, vy, len_sq, _, _) in enumerate(airport_manager._segments):
+            distance_sq = segment_distance_sq(px, py, sx, sy, vx, vy, len_sq)
+            if distance_sq < min_distance_sq:
+                min_distance_sq = distance_sq
+                nearest = row
+        _, _, _, _, _, t, i = airport_manager._segments[nearest]
+        return (t, i, math.sqrt(min_distance_sq))
+
+    def test_grid_matches_full_scan(self):
+        """Test that the segment grid finds the same segment as a scan of all segments"""
+        rng = random.Random(0)
+        for layout in ("graz_airport.json", "lowg_airport.json"):
+            airport_manager = AirportManager(os.path.join(AIRPORT_DATA, layout))
+            origin = airport_manager._origin
+            min_x, min_y, max_x, max_y = airport_manager._segment_grid_bounds
+
+            # Random points over the grid and a little beyond it, plus every segment start,
+            # where neighbouring segments are equally near
+            points = [(rng.uniform((min_x - 2) * SEGMENT_GRID_CELL, (max_x + 3) * SEGMENT_GRID_CELL),
+                       rng.uniform((min_y - 2) * SEGMENT_GRID_CELL, (max_y + 3) * SEGMENT_GRID_CELL))
+                      for _ in range(2000)]
+            points.extend((sx, sy) for sx, sy, _, _, _, _, _ in airport_manager._segments)
+
+            for px, py in points:
+                position = meters_to_lat_lon(px, py, origin)
+                # The lookup projects the position itself, so scan from the same projection
+                expected = self.brute_force(airport_manager, *lat_lon_to_meters(position[0], position[1], origin))
+                self.assertEqual(airport_manager._nearest_segment(position), expected,
+                                 f"{layout}: mismatch at {position}")
+
+class TestHoldingPoints(unittest.TestCase):
+    def linear_scan(self, airport_manager, px, py, threshold):
+        """Return the first holding point in layout order within the threshold."""
+        for holding_point in airport_manager.holding_points:
+            x, y = holding_point._xy
+            if math.hypot(x - px, y - py) <= threshold:
+                return holding_point
+        return None
+
+    def assert_matches_linear_scan(self, airport_manager, rng, samples, max_threshold):
+        origin = airport_manager._origin
+        xs = [holding_point._xy[0] for holding_point in airport_manager.holding_points]
+        ys = [holding_point._xy[1] for holding_point in airport_manager.holding_points]
+
+        for _ in range(samples):
+            # Thresholds up to one grid cell search the grid on LOWG, larger ones mostly
+            # fall back to checking every holding point
+            threshold = rng.uniform(1.0, HOLDING_GRID_CELL if rng.random() < 0.5 else max_threshold)
+            if rng.random() < 0.5:
+                # Close to a holding point, where neighbours may also be in reach
+                x, y = rng.choice(airport_manager.holding_points)._xy
+                px = x + rng.uniform(-threshold, threshold)
+                py = y + rng.uniform(-threshold, threshold)
+            else:
+                px = rng.uniform(min(xs) - max_threshold, max(xs) + max_threshold)
+                py = rng.uniform(min(ys) - max_threshold, max(ys) + max_threshold)
+
+            position = meters_to_lat_lon(px, py, origin)
+            # The lookup projects the position itself, so scan from the same projection
+            qx, qy = lat_lon_to_meters(position[0], position[1], origin)
+            self.assertIs(airport_manager.is_at_holding_point(position, threshold),
+                          self.linear_scan(airport_manager, qx, qy, threshold),
+                          f"Mismatch at {position} with threshold {threshold}")
+
+    def test_grid_matches_linear_scan(self):
+        """Test that the holding point grid finds the same holding point as a linear scan"""
+        airport_manager = AirportManager(os.path.join(AIRPORT_DATA, "lowg_airport.json"))
+        self.assert_matches_linear_scan(airport_manager, random.Random(0), 3000, 300.0)
+
+    def test_dense_grid_keeps_layout_order(self):
+        """Test the grid on closely spaced holding points, where several are in reach at once"""
+        rng = random.Random(1)
+        # 300 holding points within 400 m, so the grid is searched for every threshold
+        # below about 180 m and most thresholds reach more than one holding point
+        origin = local_origin(47.0, 15.4)
+        layout = {'name': 'Dense', 'icao': 'ZZZZ', 'holding_points': [
+            {'name': f'H{i}', 'coords': list(meters_to_lat_lon(rng.uniform(0, 400), rng.uniform(0, 400), origin)),
+             'associated_with': '17C'}
+            for i in range(300)
+        ]}
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        layout_file = os.path.join(temp_dir, "dense_airport.json")
+        with open(layout_file, 'w') as f:
+            json.dump(layout, f)
+
+        airport_manager = AirportManager(layout_file)
+        self.assert_matches_linear_scan(airport_manager, rng, 3000, 150.0)
+
+class TestLayoutCache(unittest.TestCase):
+    def setUp(self):
+        # Work on a copy so the test can modify the file
+        self.temp_dir = tempfile.mkdtemp()
+        self.layout_file = os.path.join(self.temp_dir, "graz_airport.json")
+        shutil.copy(os.path.join(AIRPORT_DATA, "graz_airport.json"), self.layout_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_unchanged_file_shares_features(self):
+        """Test that a second manager on an unchanged file reuses the loaded features"""
+        first = AirportManager(self.layout_file)
+        second = AirportManager(self.layout_file)
+
+        self.assertIs(second.taxiways[0], first.taxiways[0])
+        self.assertIs(second._segments, first._segments)
+
+        # The shared features are read-only, since the lookup structures index into them
+        for attr in ('runways', 'taxiways', 'parking_positions', 'holding_points'):
+            self.assertIsInstance(getattr(second, attr), tuple, attr)
+        self.assertIsInstance(second.taxiways[0].segments, tuple)
+
+        # Each manager still owns its route cache
+        self.assertIsNot(second._route_cache, first._route_cache)
+
+        # Route between two differently named taxiways, which goes through the route cache
+        start = first.taxiways[0]
+        end = next(taxiway for taxiway in first.taxiways if taxiway.name != start.name)
+        first.get_taxi_route(start.segments[0].start, end.segments[0].start)
+        self.assertTrue(first._route_cache)
+        self.assertFalse(second._route_cache)
+
+    def test_touched_file_is_reloaded(self):
+        """Test that changing the file's modification time forces a fresh load"""
+        first = AirportManager(self.layout_file)
+
+        stat = os.stat(self.layout_file)
+        os.utime(self.layout_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = AirportManager(self.layout_file)
+
+        self.assertIsNot(second.taxiways[0], first.taxiways[0])
+        self.assertIsNot(second._segments, first._segments)
+        self.assertEqual(second.taxiways[0].name, first.taxiways[0].name)
+
+class TestActiveRunway(unittest.TestCase):
+    def setUp(self):
+        self.airport_manager = AirportManager(os.path.join(AIRPORT_DATA, "graz_airport.json"))
+        runway = self.airport_manager.runways[0]
+        # Both directions of one runway, with headings given explicitly
+        self.airport_manager.runways = (
+            Runway("35", runway.threshold2_coords, runway.threshold1_coords, runway.width, runway.length, heading=350.0),
+            Runway("17", runway.threshold1_coords, runway.threshold2_coords, runway.width, runway.length, heading=170.0),
+        )
+
+    def test_heading_difference_wraps_around(self):
+        """Test that wind from 10 degrees picks the 350 degree runway, 20 degrees away"""
+        self.assertEqual(self.airport_manager.get_active_runway(10.0).name, "35")
+        self.assertEqual(self.airport_manager.get_active_runway(190.0).name, "17")
+
+    def test_nan_wind_still_picks_a_runway(self):
+        """Test that an undefined wind direction falls back to the first runway"""
+        self.assertEqual(self.airport_manager.get_active_runway(float('nan')).name, "35")
+
+class TestDetectionThresholds(unittest.TestCase):
+    def isolated(self, features, spacing):
+        """Return a feature with no other feature within spacing meters."""
+        for feature in features:
+            x, y = feature._xy
+            if all(other is feature or math.hypot(other._xy[0] - x, other._xy[1] - y) > spacing
+                   for other in features):
+                return feature
+        self.fail("No isolated feature in the layout")
+
+    def offset(self, airport_manager, feature, meters):
+        """Return the position the given number of meters north of a feature."""
+        x, y = feature._xy
+        return meters_to_lat_lon(x, y + meters, airport_manager._origin)
+
+    def test_parking_default_radius(self):
+        """Test that the default parking radius is 22 meters"""
+        airport_manager = AirportManager(os.path.join(AIRPORT_DATA, "graz_airport.json"))
+        parking = self.isolated(airport_manager.parking_positions, 60.0)
+
+        self.assertIs(airport_manager.get_nearest_parking(self.offset(airport_manager, parking, 10.0)), parking)
+        self.assertIsNone(airport_manager.get_nearest_parking(self.offset(airport_manager, parking, 30.0)))
+
+    def test_holding_point_default_radius(self):
+        """Test that the default holding point radius is 22 meters"""
+        airport_manager = AirportManager(os.path.join(AIRPORT_DATA, "lowg_airport.json"))
+        holding_point = self.isolated(airport_manager.holding_points, 60.0)
+
+        self.assertIs(airport_manager.is_at_holding_point(self.offset(airport_manager, holding_point, 10.0)),
+                      holding_point)
+        self.assertIsNone(airport_manager.is_at_holding_point(self.offset(airport_manager, holding_point, 30.0)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,12 @@
 import tkinter as tk
 from tkinter import filedialog
-from tkintermapview import TkinterMapView
 import json
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Tuple, Dict
 import math
 import os
-from utils.geo_utils import calculate_heading
+from utils.geo_utils import lat_lon_to_meters, local_origin, meters_to_lat_lon
 
 @dataclass
 class Runway:
@@ -38,6 +38,80 @@ class HoldingPoint:
     coords: Tuple[float, float]
     associated_with: str
 
+@lru_cache(maxsize=None)
+def unit_circle(num_points: int) -> Tuple[Tuple[float, float], ...]:
+    """Return (cos, sin) of num_points evenly spaced angles, computed once per point count."""
+    return tuple((math.cos(2 * math.pi * i / num_points), math.sin(2 * math.pi * i / num_points))
+                 for i in range(num_points))
+
+def circle(center: Tuple[float, float], radius: float,
+           num_points: int = 36) -> List[Tuple[float, float]]:
+    """Return the closed outline of a circle around the given center point."""
+    lat, lon = center
+    circle_points = [(lat + radius * cos_a, lon + radius * sin_a) for cos_a, sin_a in unit_circle(num_points)]
+
+    # Close the circle
+    circle_points.append(circle_points[0])
+    return circle_points
+
+def threshold_box(threshold, other_threshold, width, box_length=30.0) -> List[Tuple[float, float]]:
+    """Return the outline of a rectangle at the threshold, oriented along the runway.
+    width and box_length are in meters."""
+    # Work in meters around the threshold so the box is square to the runway
+    origin = local_origin(*threshold)
+    dx, dy = lat_lon_to_meters(other_threshold[0], other_threshold[1], origin)
+    length = math.hypot(dx, dy)
+    
+    # Unit vectors along the runway and across it; coinciding thresholds give a degenerate box
+    if length:
+        ux, uy = dx / length, dy / length
+    else:
+        ux, uy = 0.0, 0.0
+    nx, ny = -uy, ux
+    
+    half_width = width / 2
+    corners = [
+        (half_width * nx, half_width * ny),
+        (-half_width * nx, -half_width * ny),
+        (-half_width * nx + box_length * ux, -half_width * ny + box_length * uy),
+        (half_width * nx + box_length * ux, half_width * ny + box_length * uy),
+        (half_width * nx, half_width * ny),
+    ]
+    return [meters_to_lat_lon(x, y, origin) for x, y in corners]
+
+def surface_polygon(centerline_points, width) -> List[Tuple[float, float]]:
+    """Return the closed outline of a surface along a centerline with the given width in meters."""
+    # Work in meters around the first point so the offsets are square to the centerline
+    origin = local_origin(*centerline_points[0])
+    points = [lat_lon_to_meters(lat, lon, origin) for lat, lon in centerline_points]
+    half_width = width / 2
+    left_side = []
+    right_side = []
+    n = len(points)
+    for i in range(n):
+        if i == 0:
+            # Forward direction
+            dx = points[i+1][0] - points[i][0]
+            dy = points[i+1][1] - points[i][1]
+        elif i == n-1:
+            # Backward direction
+            dx = points[i][0] - points[i-1][0]
+            dy = points[i][1] - points[i-1][1]
+        else:
+            # Average of forward and backward
+            dx = (points[i+1][0] - points[i-1][0]) / 2
+            dy = (points[i+1][1] - points[i-1][1]) / 2
+        # Unit normal to the centerline, pointing left of the direction of travel
+        length = math.hypot(dx, dy)
+        if length:
+            nx, ny = -dy / length, dx / length
+        else:
+            nx, ny = 0.0, 0.0
+        x, y = points[i]
+        left_side.append(meters_to_lat_lon(x + half_width * nx, y + half_width * ny, origin))
+        right_side.append(meters_to_lat_lon(x - half_width * nx, y - half_width * ny, origin))
+    return left_side + right_side[::-1] + [left_side[0]]
+
 class AirportVisualizer:
     def __init__(self):
         self.root = tk.Tk()
@@ -53,13 +127,16 @@ class AirportVisualizer:
         # Load airport layout
         self.load_airport_data()
             
-        # Initialize map
+        # Initialize map; imported here so the geometry helpers above can be
+        # used without pulling in the map widget and its tile loading
+        from tkintermapview import TkinterMapView
         self.map_widget = TkinterMapView(self.root, width=1000, height=800, corner_radius=0)
         self.map_widget.pack(side="left", fill="both", expand=True)
         
         # Add cursor position label
         self.cursor_label = tk.Label(self.root, text="Lat: ---, Lon: ---", font=("Arial", 10), bg="black", fg="white", anchor="w")
         self.cursor_label.place(x=50, y=10)
+        self._cursor_update_pending = False
         self.map_widget.bind("<Motion>", self.update_cursor_label)
         
         # Set initial position to airport center
@@ -80,6 +157,9 @@ class AirportVisualizer:
         
         # Draw all areas
         self.draw_areas()
+
+        # Only the parking circles depend on the parking threshold, so move just those
+        self.parking_threshold.trace_add('write', self.on_parking_threshold_change)
         
     def select_airport_file(self) -> str:
         """Show file selection dialog and return the selected file path."""
@@ -103,6 +183,7 @@ class AirportVisualizer:
         try:
             with open(self.layout_file, 'r') as f:
                 self.layout = json.load(f)
+            self.build_geometry()
         except Exception as e:
             tk.messagebox.showerror("Error", f"Failed to load airport data: {str(e)}")
             self.root.destroy()
@@ -146,20 +227,20 @@ class AirportVisualizer:
         
         # Add checkboxes for each area type
         tk.Checkbutton(control_frame, text="Show Runways", variable=self.show_runways,
-                      command=self.redraw_areas).pack(anchor="w", pady=5)
+                      command=lambda: self.redraw_layer('runways')).pack(anchor="w", pady=5)
         
         # Taxiway controls in a subframe
         taxiway_frame = tk.Frame(control_frame)
         taxiway_frame.pack(anchor="w", pady=5)
         tk.Checkbutton(taxiway_frame, text="Show Taxiways", variable=self.show_taxiways,
-                      command=self.redraw_areas).pack(anchor="w")
+                      command=lambda: self.redraw_layer('taxiways')).pack(anchor="w")
         tk.Checkbutton(taxiway_frame, text="Show Taxiway Markers", variable=self.show_taxiway_markers,
-                      command=self.redraw_areas).pack(anchor="w", padx=20)
+                      command=lambda: self.redraw_layer('taxiways')).pack(anchor="w", padx=20)
         
         tk.Checkbutton(control_frame, text="Show Parking", variable=self.show_parking,
-                      command=self.redraw_areas).pack(anchor="w", pady=5)
+                      command=lambda: self.redraw_layer('parking')).pack(anchor="w", pady=5)
         tk.Checkbutton(control_frame, text="Show Holding Points", variable=self.show_holding,
-                      command=self.redraw_areas).pack(anchor="w", pady=5)
+                      command=lambda: self.redraw_layer('holding')).pack(anchor="w", pady=5)
         
         # Add threshold controls
         tk.Label(control_frame, text="Detection Thresholds", font=("Arial", 10, "bold")).pack(pady=(20,5))
@@ -197,6 +278,42 @@ class AirportVisualizer:
                             child.config(text=self.layout.get('name', 'Unknown Airport'))
                             break
         
+    def build_geometry(self):
+        """Compute the overlay geometry of the loaded layout once, so redraws only replay it."""
+        self.runway_geometry = []
+        for runway in self.layout.get('runways', []):
+            threshold1 = runway['threshold1_coords']
+            threshold2 = runway['threshold2_coords']
+            width = runway['width']
+            self.runway_geometry.append({
+                'name': runway['name'],
+                'polygon': surface_polygon([threshold1, threshold2], width),
+                'centerline': [threshold1, threshold2],
+                'center': ((threshold1[0] + threshold2[0]) / 2, (threshold1[1] + threshold2[1]) / 2),
+                'threshold_boxes': [threshold_box(threshold1, threshold2, width),
+                                    threshold_box(threshold2, threshold1, width)],
+            })
+
+        self.taxiway_geometry = []
+        for taxiway in self.layout.get('taxiways', []):
+            centerline = [segment['start'] for segment in taxiway['segments']]
+            centerline.append(taxiway['segments'][-1]['end'])
+            # One name marker per taxiway, at the center of its middle segment
+            segment = taxiway['segments'][len(taxiway['segments']) // 2]
+            self.taxiway_geometry.append({
+                'name': taxiway['name'],
+                'polygon': surface_polygon(centerline, taxiway['segments'][0]['width']),
+                'marker': ((segment['start'][0] + segment['end'][0]) / 2,
+                           (segment['start'][1] + segment['end'][1]) / 2),
+            })
+
+        # The parking circles depend on the threshold entry, so draw_parking builds them
+        self.parking_circles = None
+        self.parking_circle_paths = []
+
+        # Map items drawn for each layer, so a layer can be redrawn on its own
+        self.layer_items = {'runways': [], 'taxiways': [], 'parking': [], 'holding': []}
+
     def draw_areas(self):
         """Draw all airport areas on the map."""
         if self.show_runways.get():
@@ -207,198 +324,137 @@ class AirportVisualizer:
             self.draw_parking()
         if self.show_holding.get():
             self.draw_holding_points()
-            
+
     def redraw_areas(self):
         """Clear and redraw all areas."""
         self.map_widget.delete_all_marker()
         self.map_widget.delete_all_path()
+        self.map_widget.delete_all_polygon()
+        for items in self.layer_items.values():
+            items.clear()
         self.draw_areas()
-        
+
+    def redraw_layer(self, name: str):
+        """Clear and redraw a single layer, leaving the others on the map."""
+        for item in self.layer_items[name]:
+            item.delete()
+        self.layer_items[name].clear()
+
+        show, draw = {
+            'runways': (self.show_runways, self.draw_runways),
+            'taxiways': (self.show_taxiways, self.draw_taxiways),
+            'parking': (self.show_parking, self.draw_parking),
+            'holding': (self.show_holding, self.draw_holding_points),
+        }[name]
+        if show.get():
+            draw()
+
     def draw_runways(self):
         """Draw runways as filled rectangles, with detection areas and threshold boxes."""
-        for runway in self.layout['runways']:
+        items = self.layer_items['runways']
+        for runway in self.runway_geometry:
             # Draw the filled runway polygon
-            self.draw_surface_polygon([runway['threshold1_coords'], runway['threshold2_coords']], runway['width'], fill_color="#444444", outline_color="white")
+            items.append(self.map_widget.set_polygon(runway['polygon'], fill_color="#444444", outline_color="white"))
 
             # Draw runway center line
-            self.map_widget.set_path(
-                [runway['threshold1_coords'], runway['threshold2_coords']],
+            items.append(self.map_widget.set_path(
+                runway['centerline'],
                 color="white",
                 width=3
-            )
-            
-            # Draw runway width boundaries
-            width = runway['width']
-            self.draw_parallel_lines(
-                runway['threshold1_coords'],
-                runway['threshold2_coords'],
-                width/2
-            )
-            
+            ))
+
             # Add runway name
-            center_lat = (runway['threshold1_coords'][0] + runway['threshold2_coords'][0]) / 2
-            center_lon = (runway['threshold1_coords'][1] + runway['threshold2_coords'][1]) / 2
-            self.map_widget.set_marker(
-                center_lat, center_lon,
+            items.append(self.map_widget.set_marker(
+                runway['center'][0], runway['center'][1],
                 text=runway['name'],
                 text_color="blue"
-            )
-            
+            ))
+
             # Draw threshold boxes
-            self.draw_threshold_box(runway['threshold1_coords'], runway['threshold2_coords'], width)
-            self.draw_threshold_box(runway['threshold2_coords'], runway['threshold1_coords'], width)
-            
+            for box in runway['threshold_boxes']:
+                items.append(self.map_widget.set_path(box, color="red", width=2))
+
     def draw_taxiways(self):
         """Draw taxiways with their detection areas."""
-        for taxiway in self.layout['taxiways']:
-            centerline = [segment['start'] for segment in taxiway['segments']]
-            centerline.append(taxiway['segments'][-1]['end'])
-            self.draw_surface_polygon(centerline, taxiway['segments'][0]['width'], fill_color="#888888", outline_color="white")
-            
+        items = self.layer_items['taxiways']
+        for taxiway in self.taxiway_geometry:
+            items.append(self.map_widget.set_polygon(taxiway['polygon'], fill_color="#888888", outline_color="white"))
+
             # Only add taxiway name markers if enabled
             if self.show_taxiway_markers.get():
-                # Add taxiway name marker at each segment center
-                for segment in taxiway['segments']:
-                    center_lat = (segment['start'][0] + segment['end'][0]) / 2
-                    center_lon = (segment['start'][1] + segment['end'][1]) / 2
-                    self.map_widget.set_marker(
-                        center_lat, center_lon,
-                        text=taxiway['name'],
-                        text_color="black"
-                    )
-            
+                items.append(self.map_widget.set_marker(
+                    taxiway['marker'][0], taxiway['marker'][1],
+                    text=taxiway['name'],
+                    text_color="black"
+                ))
+
     def draw_parking(self):
         """Draw parking positions with their detection areas."""
-        for parking in self.layout['parking_positions']:
+        items = self.layer_items['parking']
+        # Keep the circle paths so threshold edits can move them in place
+        self.parking_circle_paths = []
+        for parking, circle_points in zip(self.layout.get('parking_positions', []), self.parking_circle_points()):
             # Draw parking spot
-            self.map_widget.set_marker(
+            items.append(self.map_widget.set_marker(
                 parking['coords'][0], parking['coords'][1],
                 text=parking['name'],
                 text_color="green"
-            )
-            
+            ))
+
             # Draw detection area circle
-            self.draw_circle(
-                parking['coords'],
-                self.parking_threshold.get()
+            path = self.map_widget.set_path(
+                circle_points,
+                color="gray",
+                width=1
             )
-            
+            items.append(path)
+            self.parking_circle_paths.append(path)
+
+    def parking_circle_points(self) -> List[List[Tuple[float, float]]]:
+        """Return the parking detection circles, rebuilding them only when the threshold has changed."""
+        radius = self.parking_threshold.get()
+        if self.parking_circles is None or self.parking_circles[0] != radius:
+            self.parking_circles = (radius, [circle(parking['coords'], radius)
+                                             for parking in self.layout.get('parking_positions', [])])
+        return self.parking_circles[1]
+
     def draw_holding_points(self):
         """Draw holding points with their detection areas."""
-        for hp in self.layout['holding_points']:
+        items = self.layer_items['holding']
+        for hp in self.layout.get('holding_points', []):
             # Draw holding point
-            self.map_widget.set_marker(
+            items.append(self.map_widget.set_marker(
                 hp['coords'][0], hp['coords'][1],
                 text=hp['name'],
                 text_color="red"
-            )
-            
-    def draw_parallel_lines(self, start: Tuple[float, float], end: Tuple[float, float], 
-                          distance: float):
-        """Draw two lines parallel to the given line at the specified distance."""
-        # Calculate perpendicular vector
-        dx = end[1] - start[1]
-        dy = end[0] - start[0]
-        length = math.sqrt(dx*dx + dy*dy)
-        dx /= length
-        dy /= length
-        
-        # Calculate offset points
-        offset1 = (start[0] + dy*distance, start[1] - dx*distance)
-        offset2 = (end[0] + dy*distance, end[1] - dx*distance)
-        offset3 = (start[0] - dy*distance, start[1] + dx*distance)
-        offset4 = (end[0] - dy*distance, end[1] + dx*distance)
-        
-        # Draw parallel lines
-        self.map_widget.set_path(
-            [offset1, offset2],
-            color="gray",
-            width=1
-        )
-        self.map_widget.set_path(
-            [offset3, offset4],
-            color="gray",
-            width=1
-        )
-        
-    def draw_circle(self, center: Tuple[float, float], radius: float, 
-                   num_points: int = 36):
-        """Draw a circle around the given center point."""
-        circle_points = []
-        for i in range(num_points):
-            angle = 2 * math.pi * i / num_points
-            lat = center[0] + radius * math.cos(angle)
-            lon = center[1] + radius * math.sin(angle)
-            circle_points.append((lat, lon))
-            
-        # Close the circle
-        circle_points.append(circle_points[0])
-        
-        self.map_widget.set_path(
-            circle_points,
-            color="gray",
-            width=1
-        )
-        
-    def draw_threshold_box(self, threshold, other_threshold, width, box_length=0.00027):
-        """Draw a rectangle at the threshold, oriented along the runway heading.
-        box_length is in degrees (approx 30m)."""
-        # Calculate heading from threshold to other_threshold
-        lat1, lon1 = threshold
-        lat2, lon2 = other_threshold
-        heading = calculate_heading(lat1, lon1, lat2, lon2)
-        
-        # Convert heading to radians
-        angle = math.radians(heading)
-        
-        # Box corners
-        half_width = width / 2 / 111320  # meters to degrees approx
-        # box_length is already in degrees (approx 30m)
-        corners = [
-            (lat1 - half_width * math.cos(angle), lon1 + half_width * math.sin(angle)),
-            (lat1 + half_width * math.cos(angle), lon1 - half_width * math.sin(angle)),
-            (lat1 + half_width * math.cos(angle) + box_length * math.sin(angle), lon1 - half_width * math.sin(angle) + box_length * math.cos(angle)),
-            (lat1 - half_width * math.cos(angle) + box_length * math.sin(angle), lon1 + half_width * math.sin(angle) + box_length * math.cos(angle)),
-            (lat1 - half_width * math.cos(angle), lon1 + half_width * math.sin(angle)),
-        ]
-        self.map_widget.set_path(corners, color="red", width=2)
-        
-    def draw_surface_polygon(self, centerline_points, width, fill_color="#888888", outline_color="white"):
-        """Draw a filled polygon along a centerline with the given width."""
-        half_width = width / 2 / 111320  # meters to degrees approx
-        left_side = []
-        right_side = []
-        n = len(centerline_points)
-        for i in range(n):
-            if i == 0:
-                # Forward direction
-                dx = centerline_points[i+1][1] - centerline_points[i][1]
-                dy = centerline_points[i+1][0] - centerline_points[i][0]
-            elif i == n-1:
-                # Backward direction
-                dx = centerline_points[i][1] - centerline_points[i-1][1]
-                dy = centerline_points[i][0] - centerline_points[i-1][0]
-            else:
-                # Average of forward and backward
-                dx1 = centerline_points[i][1] - centerline_points[i-1][1]
-                dy1 = centerline_points[i][0] - centerline_points[i-1][0]
-                dx2 = centerline_points[i+1][1] - centerline_points[i][1]
-                dy2 = centerline_points[i+1][0] - centerline_points[i][0]
-                dx = (dx1 + dx2) / 2
-                dy = (dy1 + dy2) / 2
-            angle = math.atan2(dx, dy)
-            left = (centerline_points[i][0] - half_width * math.cos(angle), centerline_points[i][1] + half_width * math.sin(angle))
-            right = (centerline_points[i][0] + half_width * math.cos(angle), centerline_points[i][1] - half_width * math.sin(angle))
-            left_side.append(left)
-            right_side.append(right)
-        polygon = left_side + right_side[::-1] + [left_side[0]]
-        self.map_widget.set_polygon(polygon, fill_color=fill_color, outline_color=outline_color)
-        
+            ))
+
+    def on_parking_threshold_change(self, *args):
+        """Resize the parking circles when the parking threshold entry holds a valid number."""
+        try:
+            self.parking_threshold.get()
+        except tk.TclError:
+            # Partially typed value such as "" or "-"
+            return
+        # Hidden circles are rebuilt by draw_parking when the layer is shown again
+        if not self.show_parking.get():
+            return
+        for path, circle_points in zip(self.parking_circle_paths, self.parking_circle_points()):
+            path.set_position_list(circle_points)
+
     def update_thresholds(self):
         """Update the visualization with new threshold values."""
         self.redraw_areas()
         
     def update_cursor_label(self, event):
+        # Coalesce motion events so the label updates at most ~30 times a second
+        if self._cursor_update_pending:
+            return
+        self._cursor_update_pending = True
+        self.root.after(33, self._refresh_cursor_label)
+
+    def _refresh_cursor_label(self):
+        self._cursor_update_pending = False
         try:
             lat, lon = self.map_widget.get_position()
             self.cursor_label.config(text=f"Map Center: Lat: {lat:.6f}, Lon: {lon:.6f}")
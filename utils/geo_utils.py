@@ -4,6 +4,9 @@ from typing import Tuple
 # Earth's radius in meters
 EARTH_RADIUS = 6371000
 
+# Length of one degree of latitude in meters
+METERS_PER_DEGREE = EARTH_RADIUS * math.pi / 180
+
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate the distance between two points using the Haversine formula.
@@ -38,14 +41,14 @@ def calculate_heading(lat1: float, lon1: float, lat2: float, lon2: float) -> flo
         Heading in degrees from 0 to 360
     """
     # Convert to radians
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    lat1 = math.radians(lat1)
+    lat2 = math.radians(lat2)
+    dlon = math.radians(lon2 - lon1)
     
-    # Calculate differences
-    dlon = lon2 - lon1
-    
-    # Calculate heading using the formula
-    y = math.sin(dlon) * math.cos(lat2)
-    x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
+    # Calculate heading using the formula, evaluating cos(lat2) only once
+    cos_lat2 = math.cos(lat2)
+    y = math.sin(dlon) * cos_lat2
+    x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * cos_lat2 * math.cos(dlon)
     
     # Calculate heading in degrees
     heading = math.degrees(math.atan2(y, x))
@@ -55,28 +58,107 @@ def calculate_heading(lat1: float, lon1: float, lat2: float, lon2: float) -> flo
     
     return heading
 
-def lat_lon_to_meters(lat: float, lon: float) -> Tuple[float, float]:
+def local_origin(lat: float, lon: float) -> Tuple[float, float, float]:
+    """
+    Build the reference point of a local tangent plane for lat_lon_to_meters.
+    
+    Args:
+        lat: Latitude of the plane origin in degrees
+        lon: Longitude of the plane origin in degrees
+        
+    Returns:
+        Tuple of (lat, lon, meters per degree of longitude at lat), angles in degrees
+    """
+    return (lat, lon, METERS_PER_DEGREE * math.cos(math.radians(lat)))
+
+def lat_lon_to_meters(lat: float, lon: float, origin: Tuple[float, float, float]) -> Tuple[float, float]:
     """
-    Convert latitude/longitude coordinates to meters using the Haversine formula.
-    This provides a good approximation for small distances.
+    Convert latitude/longitude coordinates to meters on an equirectangular plane.
+    This is accurate to well below a meter over the extent of an airport.
     
     Args:
         lat: Latitude in degrees
         lon: Longitude in degrees
+        origin: Plane reference point as returned by local_origin
         
     Returns:
-        Tuple of (x, y) coordinates in meters relative to the reference point
+        Tuple of (x, y) coordinates in meters east and north of the origin
     """
-    # Convert to radians
-    lat_rad = math.radians(lat)
-    lon_rad = math.radians(lon)
-    
-    # Calculate x and y in meters
-    x = EARTH_RADIUS * math.cos(lat_rad) * math.cos(lon_rad)
-    y = EARTH_RADIUS * math.cos(lat_rad) * math.sin(lon_rad)
+    # The degree-to-meter scales are folded into the origin, so no radians here
+    lat0, lon0, meters_per_lon = origin
+    x = (lon - lon0) * meters_per_lon
+    y = (lat - lat0) * METERS_PER_DEGREE
     
     return (x, y)
 
+def meters_to_lat_lon(x: float, y: float, origin: Tuple[float, float, float]) -> Tuple[float, float]:
+    """
+    Convert equirectangular plane coordinates back to latitude/longitude,
+    the inverse of lat_lon_to_meters.
+    
+    Args:
+        x: Meters east of the origin
+        y: Meters north of the origin
+        origin: Plane reference point as returned by local_origin
+        
+    Returns:
+        Tuple of (lat, lon) in degrees
+    """
+    lat0, lon0, meters_per_lon = origin
+    return (lat0 + y / METERS_PER_DEGREE, lon0 + x / meters_per_lon)
+
+def project_to_line(px: float, py: float, sx: float, sy: float,
+                    vx: float, vy: float, len_sq: float) -> Tuple[float, float]:
+    """
+    Project a point onto the line through a segment, in plane coordinates.
+    
+    Args:
+        px, py: The point in meters
+        sx, sy: Start of the segment in meters
+        vx, vy: Vector from the segment start to its end
+        len_sq: Squared length of the segment, must be non-zero
+        
+    Returns:
+        Tuple of (t, dist_sq): the unclamped projection parameter, which lies
+        in [0, 1] between the endpoints, and the squared perpendicular
+        distance to the line in square meters
+    """
+    ax = px - sx
+    ay = py - sy
+    t = (ax * vx + ay * vy) / len_sq
+    dx = ax - t * vx
+    dy = ay - t * vy
+    return t, dx * dx + dy * dy
+
+def segment_distance_sq(px: float, py: float, sx: float, sy: float,
+                        vx: float, vy: float, len_sq: float) -> float:
+    """
+    Calculate the squared distance from a point to a line segment in plane coordinates.
+    Takes plain floats so it can be called in tight loops without building tuples.
+    
+    Args:
+        px, py: The point in meters
+        sx, sy: Start of the segment in meters
+        vx, vy: Vector from the segment start to its end
+        len_sq: Squared length of the segment, must be non-zero
+        
+    Returns:
+        Squared distance in square meters
+    """
+    # Same arithmetic as project_to_line, inlined as this runs once per segment
+    ax = px - sx
+    ay = py - sy
+    t = (ax * vx + ay * vy) / len_sq
+    if t < 0.0:
+        # Nearest to the start point
+        return ax * ax + ay * ay
+    if t > 1.0:
+        # Nearest to the end point
+        return (ax - vx)**2 + (ay - vy)**2
+    dx = ax - t * vx
+    dy = ay - t * vy
+    return dx * dx + dy * dy
+
 def distance_to_segment(position: Tuple[float, float], 
                        segment_start: Tuple[float, float], 
                        segment_end: Tuple[float, float]) -> float:
@@ -91,34 +173,13 @@ def distance_to_segment(position: Tuple[float, float],
     Returns:
         Perpendicular distance in meters
     """
-    # Convert all coordinates to meters
-    pos_meters = lat_lon_to_meters(position[0], position[1])
-    start_meters = lat_lon_to_meters(segment_start[0], segment_start[1])
-    end_meters = lat_lon_to_meters(segment_end[0], segment_end[1])
-    
-    # Calculate segment vector
-    segment_vector = (end_meters[0] - start_meters[0], 
-                     end_meters[1] - start_meters[1])
+    # Convert to meters around the segment start, which becomes (0, 0)
+    origin = local_origin(segment_start[0], segment_start[1])
+    px, py = lat_lon_to_meters(position[0], position[1], origin)
+    vx, vy = lat_lon_to_meters(segment_end[0], segment_end[1], origin)
     
-    # Calculate vector from start to position
-    position_vector = (pos_meters[0] - start_meters[0],
-                      pos_meters[1] - start_meters[1])
-    
-    # Calculate projection parameter
-    segment_length_squared = segment_vector[0]**2 + segment_vector[1]**2
+    segment_length_squared = vx * vx + vy * vy
     if segment_length_squared == 0:
         return float('inf')
-        
-    projection = (position_vector[0] * segment_vector[0] + 
-                 position_vector[1] * segment_vector[1]) / segment_length_squared
-    
-    # Clamp projection to segment
-    projection = max(0, min(1, projection))
-    
-    # Calculate projected point
-    projected_point = (start_meters[0] + projection * segment_vector[0],
-                      start_meters[1] + projection * segment_vector[1])
     
-    # Calculate distance to projected point
-    return ((pos_meters[0] - projected_point[0])**2 + 
-            (pos_meters[1] - projected_point[1])**2)**0.5 
\ No newline at end of file
+    return math.sqrt(segment_distance_sq(px, py, 0.0, 0.0, vx, vy, segment_length_squared))